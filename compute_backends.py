@@ -0,0 +1,239 @@
+"""Compute backends for the Watsons Turkey Automation Dashboard.
+
+A backend owns the table representation and the column kernels the metric
+definitions in ``data_processor`` are written against, so the same metrics
+run either on pandas or on Arrow-native columnar data.
+"""
+
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; only the arrow backend needs it
+    pa = None
+
+# Backend-native table (pandas DataFrame or pyarrow Table)
+Frame = Any
+# Backend-native column of values
+Column = Any
+# Boolean row mask supporting &, |, ~ and .sum()
+Mask = Any
+
+# One row keyed by CSV column name
+Record = Dict[str, Any]
+
+# Strings pandas reads as missing by default; the arrow reader uses the same set
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+class ComputeBackend(ABC):
+    """Column operations used by the metric definitions."""
+
+    name = ""
+
+    @abstractmethod
+    def read_csv(self, path: Union[str, BinaryIO], compression: Optional[str]) -> Frame:
+        """Read a (possibly compressed) CSV file or binary stream into a table."""
+
+    @abstractmethod
+    def from_records(self, rows: Sequence[Record]) -> Frame:
+        """Build a table from rows keyed by column name; absent keys are missing."""
+
+    @abstractmethod
+    def empty(self) -> Frame:
+        """Return an empty table."""
+
+    @abstractmethod
+    def num_rows(self, table: Frame) -> int:
+        """Return the number of rows in a table."""
+
+    @abstractmethod
+    def has_column(self, table: Frame, col: str) -> bool:
+        """Return whether a table has the given column."""
+
+    @abstractmethod
+    def normalized(self, table: Frame, col: str) -> Column:
+        """Column values lowercased and stripped, missing values as empty string."""
+
+    @abstractmethod
+    def stripped(self, table: Frame, col: str) -> Column:
+        """Column values stripped, missing values as empty string."""
+
+    @abstractmethod
+    def isin(self, values: Column, options: Iterable[str]) -> Mask:
+        """Mask of values contained in options."""
+
+    @abstractmethod
+    def equals(self, values: Column, option: str) -> Mask:
+        """Mask of values equal to option."""
+
+    @abstractmethod
+    def filter(self, table: Frame, mask: Mask) -> Frame:
+        """Rows of a table selected by mask."""
+
+    @abstractmethod
+    def split_at_first_null(self, table: Frame, col: str) -> Tuple[Frame, Frame]:
+        """Split a table around the first row where col is missing.
+
+        Returns the rows before and after that row, or the whole table and an
+        empty table when the column has no missing values.
+        """
+
+    @abstractmethod
+    def to_list(self, table: Frame, col: str) -> List[Any]:
+        """Column values as Python objects, missing values as None."""
+
+
+class PandasBackend(ComputeBackend):
+    """Backend on pandas DataFrames and object-string operations."""
+
+    name = "pandas"
+
+    def read_csv(self, path: Union[str, BinaryIO], compression: Optional[str]) -> pd.DataFrame:
+        return pd.read_csv(path, compression=compression)
+
+    def from_records(self, rows: Sequence[Record]) -> pd.DataFrame:
+        return pd.DataFrame(list(rows), columns=record_columns(rows))
+
+    def empty(self) -> pd.DataFrame:
+        return pd.DataFrame()
+
+    def num_rows(self, table: pd.DataFrame) -> int:
+        return len(table)
+
+    def has_column(self, table: pd.DataFrame, col: str) -> bool:
+        return col in table.columns
+
+    def normalized(self, table: pd.DataFrame, col: str) -> pd.Series:
+        return self.stripped(table, col).str.lower()
+
+    def stripped(self, table: pd.DataFrame, col: str) -> pd.Series:
+        if col not in table.columns:
+            return pd.Series([""] * len(table), index=table.index, dtype=object)
+        return table[col].fillna("").astype(str).str.strip()
+
+    def isin(self, values: pd.Series, options: Iterable[str]) -> pd.Series:
+        return values.isin(options)
+
+    def equals(self, values: pd.Series, option: str) -> pd.Series:
+        return values == option
+
+    def filter(self, table: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
+        return table[mask]
+
+    def split_at_first_null(
+        self, table: pd.DataFrame, col: str
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        empty_rows = table[table[col].isna()].index
+        if len(empty_rows) == 0:
+            return table, self.empty()
+
+        split_idx = empty_rows[0]
+        head = table.iloc[:split_idx].copy()
+        tail = table.iloc[split_idx + 1 :].copy().reset_index(drop=True)
+        return head, tail
+
+    def to_list(self, table: pd.DataFrame, col: str) -> List[Any]:
+        values = table[col].astype(object)
+        return values.where(values.notna(), None).tolist()
+
+
+class ArrowBackend(ComputeBackend):
+    """Backend on pyarrow Tables with vectorized, multithreaded compute kernels."""
+
+    name = "arrow"
+
+    def __init__(self) -> None:
+        if pa is None:
+            raise ImportError("The arrow backend requires the pyarrow package")
+
+    def read_csv(self, path: Union[str, BinaryIO], compression: Optional[str]) -> "pa.Table":
+        parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+        convert_options = pa_csv.ConvertOptions(null_values=NA_VALUES, strings_can_be_null=True)
+
+        if compression == "zip":
+            with zipfile.ZipFile(path) as archive:
+                members = [name for name in archive.namelist() if not name.endswith("/")]
+                if len(members) != 1:
+                    raise ValueError(f"Expected one CSV in ZIP archive, found {len(members)}")
+                with archive.open(members[0]) as stream:
+                    return pa_csv.read_csv(
+                        stream, parse_options=parse_options, convert_options=convert_options
+                    )
+
+        with pa.input_stream(path, compression=compression) as stream:
+            return pa_csv.read_csv(stream, parse_options=parse_options, convert_options=convert_options)
+
+    def from_records(self, rows: Sequence[Record]) -> "pa.Table":
+        return pa.table({col: [row.get(col) for row in rows] for col in record_columns(rows)})
+
+    def empty(self) -> "pa.Table":
+        return pa.table({})
+
+    def num_rows(self, table: "pa.Table") -> int:
+        return table.num_rows
+
+    def has_column(self, table: "pa.Table", col: str) -> bool:
+        return col in table.column_names
+
+    def normalized(self, table: "pa.Table", col: str) -> "pa.ChunkedArray":
+        return pc.utf8_lower(self.stripped(table, col))
+
+    def stripped(self, table: "pa.Table", col: str) -> "pa.ChunkedArray":
+        if col not in table.column_names:
+            return pa.chunked_array([pa.array([""] * table.num_rows, pa.string())])
+        values = table.column(col)
+        if not pa.types.is_string(values.type):
+            values = pc.cast(values, pa.string())
+        return pc.utf8_trim_whitespace(pc.fill_null(values, ""))
+
+    def isin(self, values: "pa.ChunkedArray", options: Iterable[str]) -> Any:
+        value_set = pa.array(sorted(options), pa.string())
+        return pc.is_in(values, value_set=value_set).to_numpy()
+
+    def equals(self, values: "pa.ChunkedArray", option: str) -> Any:
+        return pc.equal(values, option).to_numpy()
+
+    def filter(self, table: "pa.Table", mask: Any) -> "pa.Table":
+        return table.filter(pa.array(mask))
+
+    def split_at_first_null(self, table: "pa.Table", col: str) -> Tuple["pa.Table", "pa.Table"]:
+        nulls = pc.is_null(table.column(col), nan_is_null=True)
+        split_idx = pc.index(nulls, True).as_py()
+        if split_idx < 0:
+            return table, self.empty()
+        return table.slice(0, split_idx), table.slice(split_idx + 1)
+
+    def to_list(self, table: "pa.Table", col: str) -> List[Any]:
+        return table.column(col).to_pylist()
+
+
+def record_columns(rows: Sequence[Record]) -> List[str]:
+    """Union of the rows' keys, in first-seen order."""
+    return list(dict.fromkeys(col for row in rows for col in row))
+
+
+BACKENDS: Dict[str, Type[ComputeBackend]] = {
+    PandasBackend.name: PandasBackend,
+    ArrowBackend.name: ArrowBackend,
+}
+
+DEFAULT_BACKEND = PandasBackend.name
+
+
+def get_backend(name: str) -> ComputeBackend:
+    """Return a backend instance by name ('pandas' or 'arrow')."""
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown compute backend '{name}', expected one of {sorted(BACKENDS)}") from None
+    return backend_cls()
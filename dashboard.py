@@ -2,13 +2,26 @@
 
 import logging
 import os
+import queue
+import shutil
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 import streamlit as st
 
-from data_processor import AutomationDataProcessor
+from data_processor import (
+    NA_RATIO_THRESHOLD,
+    AutomationDataProcessor,
+    LazyMetrics,
+    calculate_coverage,
+    calculate_na_ratio,
+)
+from metrics_exporter import REGISTRY, start_exporter
+from testrail_client import TestRailClient
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,6 +67,17 @@ h3 { color: #1e293b; font-weight: 700; }
 </style>
 """
 
+# TestRail instance, baseline suite and plan the dashboard reports on
+TESTRAIL_URL = "https://elabaswatson.testrail.io"
+BASELINE_SUITE_ID = 7544
+PLAN_ID = 61979
+
+# Interface the opt-in /metrics endpoint binds to (override with METRICS_HOST)
+METRICS_HOST = "127.0.0.1"
+
+# Accepted upload extensions: plain CSV or a compressed TestRail export
+UPLOAD_TYPES = ["csv", "gz", "zip", "zst"]
+
 # Color palette for charts
 CHART_COLORS = [
     "#3b82f6", "#8b5cf6", "#ec4899", "#f59e0b", "#10b981", "#6366f1",
@@ -61,26 +85,25 @@ CHART_COLORS = [
 ]
 
 
-def load_metrics(baseline_file: Any, plan_file: Any) -> Optional[Dict]:
-    """Process uploaded CSV files and return metrics."""
+def _save_upload(uploaded_file: Any) -> str:
+    """Stream an uploaded file to a temporary path, keeping it compressed."""
+    suffix = os.path.splitext(uploaded_file.name)[1] or ".csv"
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=suffix, delete=False) as f:
+        shutil.copyfileobj(uploaded_file, f)
+        return f.name
+
+
+@contextmanager
+def uploaded_processor(baseline_file: Any, plan_file: Any) -> Iterator[AutomationDataProcessor]:
+    """Processor over uploaded files, kept on disk while the block runs."""
     baseline_path: Optional[str] = None
     plan_path: Optional[str] = None
 
     try:
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".csv", delete=False) as f:
-            f.write(baseline_file.getvalue())
-            baseline_path = f.name
-
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".csv", delete=False) as f:
-            f.write(plan_file.getvalue())
-            plan_path = f.name
-
-        processor = AutomationDataProcessor(baseline_path, plan_path)
-        return processor.get_all_metrics()
-
-    except Exception as e:
-        logger.error("Error processing files: %s", e)
-        return None
+        baseline_path = _save_upload(baseline_file)
+        plan_path = _save_upload(plan_file)
+        yield AutomationDataProcessor(baseline_path, plan_path)
 
     finally:
         for path in (baseline_path, plan_path):
@@ -91,65 +114,145 @@ def load_metrics(baseline_file: Any, plan_file: Any) -> Optional[Dict]:
                     pass
 
 
-def render_metrics(metrics: Dict) -> None:
-    """Render the main metrics cards."""
-    col1, col2, col3, col4, col5 = st.columns(5, gap="medium")
+@st.cache_resource
+def get_testrail_client() -> Optional[TestRailClient]:
+    """Shared TestRail client (keeps pooled connections and ETag cache across reruns)."""
+    user = os.environ.get("TESTRAIL_USER")
+    api_key = os.environ.get("TESTRAIL_API_KEY")
+    if not user or not api_key:
+        return None
+    return TestRailClient(os.environ.get("TESTRAIL_URL", TESTRAIL_URL), user, api_key)
 
-    with col1:
-        auto = metrics["automated"]
-        st.metric("✅ Automated", f"{auto['total']:,}", help="Total automated test cases")
-        st.markdown(
-            f'<div class="breakdown-text">'
-            f'<b>D:</b> {auto["desktop"]:,} | <b>M:</b> {auto["mobile"]:,}'
-            f'</div>',
-            unsafe_allow_html=True,
-        )
 
-    with col2:
-        backlog = metrics["backlog"]
-        st.metric("📋 Backlog", f"{backlog['smart_total']:,}", help="Backlog with smart deduplication")
-        st.markdown(
-            f'<div class="breakdown-text">'
-            f'<b>D:</b> {backlog["desktop"]:,} | '
-            f'<b>M:</b> {backlog["mobile"]:,} | <b>B:</b> {backlog["both"]:,}'
-            f'</div>',
-            unsafe_allow_html=True,
-        )
+def _clear_testrail_fetch() -> None:
+    """Show uploaded files again instead of the last TestRail fetch."""
+    st.session_state["testrail_fetched"] = False
 
-    with col3:
-        in_review_raw = metrics.get("in_review", {"desktop": 0, "mobile": 0, "total": 0})
-        if isinstance(in_review_raw, int):
-            in_review = {"desktop": 0, "mobile": 0, "total": in_review_raw}
-        else:
-            in_review = in_review_raw
-        st.metric("🔍 In Review", f"{in_review['total']:,}", help="Tests with 'Passed with issue' status")
-        st.markdown(
-            f'<div class="breakdown-text">'
-            f'<b>D:</b> {in_review["desktop"]:,} | <b>M:</b> {in_review["mobile"]:,}'
-            f'</div>',
-            unsafe_allow_html=True,
-        )
 
-    with col4:
-        st.metric("🚫 Blocked", f"{metrics['blocked']:,}", help="Currently blocked tests")
+@st.cache_resource
+def start_metrics_exporter() -> None:
+    """Start the /metrics endpoint once per server process if METRICS_PORT is set."""
+    port = os.environ.get("METRICS_PORT", "").strip()
+    if not port or port == "0":
+        return
+    if not port.isdigit() or int(port) > 65535:
+        logger.warning("Invalid METRICS_PORT %r, metrics exporter not started", port)
+        return
+    start_exporter(int(port), host=os.environ.get("METRICS_HOST", METRICS_HOST))
 
-    with col5:
-        na = metrics["not_applicable"]
-        armonic = metrics["not_applicable_detailed"]["armonic"]
-        st.metric("➖ Not Applicable", f"{na['total']:,}", help="Tests not applicable for automation")
-        st.markdown(
-            f'<div class="breakdown-text">'
-            f'<b>D:</b> {na["desktop"]:,} | '
-            f'<b>M:</b> {na["mobile"]:,} | <b>B:</b> {na["both"]:,}'
-            f'</div>',
-            unsafe_allow_html=True,
-        )
-        st.markdown(
-            f'<div class="breakdown-text" style="margin-top: 0.5rem; font-size: 0.85rem;">'
-            f'<b>Armonic:</b> {armonic["total"]:,}'
-            f'</div>',
-            unsafe_allow_html=True,
-        )
+
+def _evaluate_stage(metrics: LazyMetrics, source: str, names: Tuple[str, ...], events: queue.Queue) -> None:
+    """Load one source and evaluate its metric groups, posting each result (worker thread)."""
+    try:
+        with REGISTRY.time(f"load_{source}"):
+            loaded = metrics.load(source)
+        if not loaded:
+            events.put((source, "failed", None, None))
+            return
+        events.put((source, "loaded", None, None))
+        for name in names:
+            with REGISTRY.time(name):
+                value = metrics[name]
+            if value is None:
+                events.put((source, "failed", name, None))
+                return
+            events.put((source, "metric", name, value))
+    except Exception as e:
+        logger.error("Error processing %s: %s", source, e)
+        events.put((source, "failed", None, None))
+    finally:
+        events.put((source, "done", None, None))
+
+
+def stream_metrics(processor: AutomationDataProcessor) -> Iterator[Tuple[str, str, Optional[str], Any]]:
+    """Process baseline and plan off the script thread, yielding events as they complete.
+
+    Events are ``(stage, kind, metric name, value)`` with kind 'loaded',
+    'metric' or 'failed'.
+    """
+    metrics = processor.metrics()
+    events: queue.Queue = queue.Queue()
+    pool = ThreadPoolExecutor(max_workers=len(STAGES), thread_name_prefix="metrics")
+    try:
+        for source, names in STAGES.items():
+            pool.submit(_evaluate_stage, metrics, source, names, events)
+
+        pending = len(STAGES)
+        while pending:
+            event = events.get()
+            if event[1] == "done":
+                pending -= 1
+            else:
+                yield event
+    finally:
+        # Don't block a Streamlit rerun on stages still running after an interrupt
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def render_automated_card(metrics: Dict) -> None:
+    """Render the Automated metric card."""
+    auto = metrics["automated"]
+    st.metric("✅ Automated", f"{auto['total']:,}", help="Total automated test cases")
+    st.markdown(
+        f'<div class="breakdown-text">'
+        f'<b>D:</b> {auto["desktop"]:,} | <b>M:</b> {auto["mobile"]:,}'
+        f'</div>',
+        unsafe_allow_html=True,
+    )
+
+
+def render_backlog_card(metrics: Dict) -> None:
+    """Render the Backlog metric card."""
+    backlog = metrics["backlog"]
+    st.metric("📋 Backlog", f"{backlog['smart_total']:,}", help="Backlog with smart deduplication")
+    st.markdown(
+        f'<div class="breakdown-text">'
+        f'<b>D:</b> {backlog["desktop"]:,} | '
+        f'<b>M:</b> {backlog["mobile"]:,} | <b>B:</b> {backlog["both"]:,}'
+        f'</div>',
+        unsafe_allow_html=True,
+    )
+
+
+def render_in_review_card(metrics: Dict) -> None:
+    """Render the In Review metric card."""
+    in_review_raw = metrics.get("in_review", {"desktop": 0, "mobile": 0, "total": 0})
+    if isinstance(in_review_raw, int):
+        in_review = {"desktop": 0, "mobile": 0, "total": in_review_raw}
+    else:
+        in_review = in_review_raw
+    st.metric("🔍 In Review", f"{in_review['total']:,}", help="Tests with 'Passed with issue' status")
+    st.markdown(
+        f'<div class="breakdown-text">'
+        f'<b>D:</b> {in_review["desktop"]:,} | <b>M:</b> {in_review["mobile"]:,}'
+        f'</div>',
+        unsafe_allow_html=True,
+    )
+
+
+def render_blocked_card(metrics: Dict) -> None:
+    """Render the Blocked metric card."""
+    st.metric("🚫 Blocked", f"{metrics['blocked']:,}", help="Currently blocked tests")
+
+
+def render_na_card(metrics: Dict) -> None:
+    """Render the Not Applicable metric card."""
+    na = metrics["not_applicable"]
+    armonic = metrics["not_applicable_detailed"]["armonic"]
+    st.metric("➖ Not Applicable", f"{na['total']:,}", help="Tests not applicable for automation")
+    st.markdown(
+        f'<div class="breakdown-text">'
+        f'<b>D:</b> {na["desktop"]:,} | '
+        f'<b>M:</b> {na["mobile"]:,} | <b>B:</b> {na["both"]:,}'
+        f'</div>',
+        unsafe_allow_html=True,
+    )
+    st.markdown(
+        f'<div class="breakdown-text" style="margin-top: 0.5rem; font-size: 0.85rem;">'
+        f'<b>Armonic:</b> {armonic["total"]:,}'
+        f'</div>',
+        unsafe_allow_html=True,
+    )
 
 
 def render_na_threshold(metrics: Dict) -> None:
@@ -159,10 +262,10 @@ def render_na_threshold(metrics: Dict) -> None:
 
     auto_total = metrics["automated"]["total"]
     armonic_na = metrics["not_applicable_detailed"]["armonic"]["total"]
-    threshold = 15.0
+    threshold = NA_RATIO_THRESHOLD
 
     total_completed = auto_total + armonic_na
-    na_ratio = (armonic_na / total_completed * 100) if total_completed > 0 else 0
+    na_ratio = calculate_na_ratio(metrics)
 
     if na_ratio <= threshold:
         status_color, status_text, status_icon = "#22c55e", "Within threshold", "✅"
@@ -321,7 +424,7 @@ def render_summary(metrics: Dict) -> None:
         applicable = auto_total + backlog_total + in_review_total + blocked_total
 
         if applicable > 0:
-            coverage = (auto_total / applicable) * 100
+            coverage = calculate_coverage(metrics)
             st.markdown(
                 f"""
                 <div class="summary-metric">
@@ -347,13 +450,98 @@ def render_summary(metrics: Dict) -> None:
             )
 
 
+# Processing stages: source file -> metric groups computed from it, in render order
+STAGES: Dict[str, Tuple[str, ...]] = {
+    "baseline": ("automated",),
+    "plan": ("backlog", "blocked", "in_review", "not_applicable_detailed", "not_applicable", "na_reasons"),
+}
+STAGE_LABELS = {"baseline": "📁 Baseline", "plan": "📁 Plan"}
+
+# Metric cards (one column each) and the metric groups they need
+METRIC_CARDS: Tuple[Tuple[Callable[[Dict], None], Tuple[str, ...]], ...] = (
+    (render_automated_card, ("automated",)),
+    (render_backlog_card, ("backlog",)),
+    (render_in_review_card, ("in_review",)),
+    (render_blocked_card, ("blocked",)),
+    (render_na_card, ("not_applicable", "not_applicable_detailed")),
+)
+
+# Full-width sections below the cards and the metric groups they need
+SECTIONS: Tuple[Tuple[Callable[[Dict], None], Tuple[str, ...]], ...] = (
+    (render_na_threshold, ("automated", "not_applicable_detailed")),
+    (render_na_reasons, ("na_reasons",)),
+    (render_summary, ("automated", "backlog", "in_review", "blocked", "not_applicable")),
+)
+
+
+def render_progressive(processor: AutomationDataProcessor) -> bool:
+    """Render each card and section as soon as the metrics it needs are ready.
+
+    Shows a progress bar per stage while processing; returns False if a stage
+    fails (sections of the other stage are still rendered). On success the
+    metrics become the exporter's KPI snapshot.
+    """
+    started = time.perf_counter()
+    processed_slot = st.empty()
+    progress = {
+        stage: st.progress(0.0, text=f"{STAGE_LABELS[stage]}: loading...") for stage in STAGES
+    }
+    steps = {stage: 0 for stage in STAGES}
+    st.divider()
+
+    views = []
+    for col, (render, needs) in zip(st.columns(len(METRIC_CARDS), gap="medium"), METRIC_CARDS):
+        slot = col.empty()
+        slot.caption("⏳ Processing...")
+        views.append((slot, render, needs))
+    views.extend((st.empty(), render, needs) for render, needs in SECTIONS)
+
+    metrics: Dict[str, Any] = {}
+    failed = False
+    for stage, kind, name, value in stream_metrics(processor):
+        if kind == "failed":
+            progress[stage].progress(1.0, text=f"{STAGE_LABELS[stage]}: failed")
+            failed = True
+            continue
+
+        steps[stage] += 1
+        done = steps[stage] / (len(STAGES[stage]) + 1)
+        step = name.replace("_", " ") if name else "loaded"
+        progress[stage].progress(done, text=f"{STAGE_LABELS[stage]}: {step} ({done:.0%})")
+        if kind != "metric":
+            continue
+
+        metrics[name] = value
+        for view in list(views):
+            slot, render, needs = view
+            if all(need in metrics for need in needs):
+                with slot.container():
+                    render(metrics)
+                views.remove(view)
+
+    if failed:
+        return False
+
+    REGISTRY.observe("total", time.perf_counter() - started)
+    REGISTRY.update_kpis(metrics)
+    for bar in progress.values():
+        bar.empty()
+    processed_slot.markdown(
+        f"<p id='metrics-section' style='text-align: center; color: #64748b;'>"
+        f"📅 Processed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>",
+        unsafe_allow_html=True,
+    )
+    return True
+
+
 def main() -> None:
     """Main application entry point."""
+    start_metrics_exporter()
     st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
     st.markdown('<h1 class="main-header">📊 Watsons Turkey Automation Dashboard</h1>', unsafe_allow_html=True)
     st.markdown(
         "<p style='text-align: center; color: #64748b; margin-bottom: 2rem;'>"
-        "Upload your baseline and plan CSV files to visualize automation metrics</p>",
+        "Upload your baseline and plan CSV files (plain or .gz/.zip/.zst) to visualize automation metrics</p>",
         unsafe_allow_html=True,
     )
 
@@ -361,45 +549,58 @@ def main() -> None:
 
     with col1:
         st.markdown("#### 📁 Baseline File")
-        st.caption("[TestRail Baseline Suite](https://elabaswatson.testrail.io/index.php?/suites/view/7544)")
-        baseline = st.file_uploader("Upload baseline CSV", type=["csv"], key="baseline", label_visibility="collapsed")
+        st.caption(f"[TestRail Baseline Suite]({TESTRAIL_URL}/index.php?/suites/view/{BASELINE_SUITE_ID})")
+        baseline = st.file_uploader(
+            "Upload baseline CSV", type=UPLOAD_TYPES, key="baseline", label_visibility="collapsed",
+            on_change=_clear_testrail_fetch,
+        )
         if baseline:
             st.success(f"✅ {baseline.name} ({baseline.size:,} bytes)")
 
     with col2:
         st.markdown("#### 📁 Plan File")
-        st.caption("[TestRail Plan](https://elabaswatson.testrail.io/index.php?/plans/view/61979)")
-        plan = st.file_uploader("Upload plan CSV", type=["csv"], key="plan", label_visibility="collapsed")
+        st.caption(f"[TestRail Plan]({TESTRAIL_URL}/index.php?/plans/view/{PLAN_ID})")
+        plan = st.file_uploader(
+            "Upload plan CSV", type=UPLOAD_TYPES, key="plan", label_visibility="collapsed",
+            on_change=_clear_testrail_fetch,
+        )
         if plan:
             st.success(f"✅ {plan.name} ({plan.size:,} bytes)")
 
-    if baseline and plan:
-        st.divider()
+    client = get_testrail_client()
+    if client is not None and st.button("🔄 Fetch latest from TestRail", use_container_width=True):
+        st.session_state["testrail_fetched"] = True
+    # Keep showing the fetched data on reruns until files are uploaded again
+    fetch = client is not None and st.session_state.get("testrail_fetched", False)
 
-        with st.spinner("🔄 Processing data..."):
-            metrics = load_metrics(baseline, plan)
+    if fetch or (baseline and plan):
+        st.divider()
 
-        if metrics is None:
-            st.error("❌ Error processing files. Please check CSV format and try again.")
+        if fetch:
+            requests_before, not_modified_before = client.requests_sent, client.not_modified
+            ok = render_progressive(client.processor(BASELINE_SUITE_ID, PLAN_ID))
+            hits = client.not_modified - not_modified_before
+            REGISTRY.count_cache("testrail_etag", hits=hits, misses=client.requests_sent - requests_before - hits)
+        else:
+            with uploaded_processor(baseline, plan) as processor:
+                ok = render_progressive(processor)
+
+        if not ok:
+            if fetch:
+                st.error("❌ Error fetching from TestRail. Please check the API credentials and try again.")
+            else:
+                st.error("❌ Error processing files. Please check CSV format and try again.")
             st.stop()
 
-        st.markdown(
-            f"<p id='metrics-section' style='text-align: center; color: #64748b;'>"
-            f"📅 Processed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>",
-            unsafe_allow_html=True,
-        )
-
-        st.divider()
-        render_metrics(metrics)
-        render_na_threshold(metrics)
-        render_na_reasons(metrics)
-        render_summary(metrics)
-
     else:
         st.info("👆 Upload both CSV files to view dashboard")
+        if client is None:
+            st.caption("Set `TESTRAIL_USER` and `TESTRAIL_API_KEY` to fetch directly from TestRail.")
         with st.expander("ℹ️ Required File Format"):
             st.markdown(
                 """
+Files may be uploaded as plain `.csv` or compressed as `.gz`, `.zip` (single CSV) or `.zst`.
+
 **Baseline CSV** columns: `Automation Status Testim Desktop`, `Automation Status Testim Mobile View`
 - Values: "Automated UAT" or "Automated Prod"
 
@@ -1,14 +1,44 @@
 """Data processor for Watsons Turkey Automation Dashboard.
 
-Version: 2.1 - In Review returns Dict with desktop/mobile/total breakdown.
+Version: 2.4 - Processor also accepts in-memory rows (e.g. from the TestRail API),
+optionally fetched only when first needed.
 """
 
+import argparse
+import copy
+import json
 import logging
+import sys
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from compute_backends import BACKENDS, DEFAULT_BACKEND, Column, ComputeBackend, Frame, Mask, Record, get_backend
 
 logger = logging.getLogger(__name__)
 
+# Armonic NA ratio (percent) above which the plan needs attention
+NA_RATIO_THRESHOLD = 15.0
+
+# In-memory rows, or a callable producing them when the source is first loaded
+RowSource = Union[Sequence[Record], Callable[[], Sequence[Record]]]
+
+# Leading bytes of the archive formats TestRail exports are stored in.
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"PK\x03\x04": "zip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Return the pandas compression name for a file by sniffing its header."""
+    with open(path, "rb") as f:
+        header = f.read(4)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return compression
+    return None
+
 
 class AutomationDataProcessor:
     """Processes automation test data from baseline and plan CSV files."""
@@ -27,73 +57,95 @@ class AutomationDataProcessor:
     BLOCKED_STATUS = "blocked"
     IN_REVIEW_STATUS = "passed with issue"
 
-    def __init__(self, baseline_path: str, plan_path: str) -> None:
-        """Initialize processor with file paths."""
+    def __init__(self, baseline_path: str, plan_path: str, backend: str = DEFAULT_BACKEND) -> None:
+        """Initialize processor with file paths and the default compute backend."""
         self._baseline_path = baseline_path
         self._plan_path = plan_path
-        self._baseline_df: Optional[pd.DataFrame] = None
-        self._plan_df: Optional[pd.DataFrame] = None
-
-    def _load_data(self) -> bool:
-        """Load CSV files into dataframes."""
+        self._backend: ComputeBackend = get_backend(backend)
+        self._baseline_rows: Optional[RowSource] = None
+        self._plan_rows: Optional[RowSource] = None
+        self._baseline_df: Optional[Frame] = None
+        self._plan_df: Optional[Frame] = None
+
+    @classmethod
+    def from_records(
+        cls,
+        baseline_rows: RowSource,
+        plan_rows: RowSource,
+        backend: str = DEFAULT_BACKEND,
+    ) -> "AutomationDataProcessor":
+        """Create a processor over in-memory rows keyed by CSV column name.
+
+        Plan rows follow the CSV export layout: Desktop rows, an empty row,
+        then Mobile rows. Either source may be a callable, which is only
+        called when a metric first needs that source.
+        """
+        processor = cls("", "", backend=backend)
+        processor._baseline_rows = baseline_rows
+        processor._plan_rows = plan_rows
+        return processor
+
+    def _read_csv(self, path: str) -> Frame:
+        """Read a plain or compressed CSV, decompressing on the fly."""
+        return self._backend.read_csv(path, detect_compression(path))
+
+    def _load_source(self, path: str, rows: Optional[RowSource]) -> Optional[Frame]:
+        """Load in-memory rows or one CSV file, logging and returning None on failure."""
         try:
-            self._baseline_df = pd.read_csv(self._baseline_path)
-            self._plan_df = pd.read_csv(self._plan_path)
-            return True
+            if rows is not None:
+                return self._backend.from_records(rows() if callable(rows) else rows)
+            return self._read_csv(path)
         except FileNotFoundError as e:
             logger.error("File not found: %s", e.filename)
-            return False
+            return None
+        except ImportError as e:
+            logger.error("Missing decompression support: %s", e)
+            return None
         except pd.errors.EmptyDataError:
-            logger.error("One or more CSV files are empty")
-            return False
+            logger.error("CSV file is empty: %s", path)
+            return None
         except pd.errors.ParserError as e:
             logger.error("CSV parsing error: %s", e)
-            return False
+            return None
         except Exception as e:
             logger.error("Unexpected error loading data: %s", e)
-            return False
+            return None
+
+    def _load_baseline(self) -> bool:
+        """Load the baseline into its dataframe."""
+        self._baseline_df = self._load_source(self._baseline_path, self._baseline_rows)
+        return self._baseline_df is not None
+
+    def _load_plan(self) -> bool:
+        """Load the plan into its dataframe."""
+        self._plan_df = self._load_source(self._plan_path, self._plan_rows)
+        return self._plan_df is not None
 
-    def _normalize_column(self, df: pd.DataFrame, col: str) -> pd.Series:
+    def _normalize_column(self, df: Frame, col: str) -> Column:
         """Normalize column values: lowercase, stripped, NaN as empty string."""
-        if col not in df.columns:
-            return pd.Series([""] * len(df), index=df.index)
-        return df[col].fillna("").astype(str).str.strip().str.lower()
-
-    def _get_device_value(self, df: pd.DataFrame, idx: int) -> str:
-        """Safely get device value at index."""
-        if self.DEVICE_COL not in df.columns:
-            return ""
-        raw_value = df[self.DEVICE_COL].iloc[idx]
-        return str(raw_value).strip() if pd.notna(raw_value) else ""
-
-    def _count_by_device_smart(
-        self, df: pd.DataFrame, desktop_mask: pd.Series, mobile_mask: pd.Series
-    ) -> Dict[str, int]:
-        """Count with smart deduplication based on device type."""
-        desktop_count = mobile_count = both_count = 0
-
-        for i in range(len(df)):
-            device = self._get_device_value(df, i)
-            d_match = desktop_mask.iloc[i]
-            m_match = mobile_mask.iloc[i]
-
-            if device == "Both":
-                if d_match and m_match:
-                    both_count += 1
-                elif d_match:
-                    desktop_count += 1
-                elif m_match:
-                    mobile_count += 1
-            elif device == "Desktop" and d_match:
-                desktop_count += 1
-            elif device == "Mobile" and m_match:
-                mobile_count += 1
-            elif d_match and m_match:
-                both_count += 1
-            elif d_match:
-                desktop_count += 1
-            elif m_match:
-                mobile_count += 1
+        return self._backend.normalized(df, col)
+
+    def _device_masks(self, df: Frame) -> Tuple[Mask, Mask]:
+        """Masks of rows whose Device is exactly 'Desktop' and exactly 'Mobile'."""
+        device = self._backend.stripped(df, self.DEVICE_COL)
+        return self._backend.equals(device, "Desktop"), self._backend.equals(device, "Mobile")
+
+    def _count_by_device_smart(self, df: Frame, desktop_mask: Mask, mobile_mask: Mask) -> Dict[str, int]:
+        """Count with smart deduplication based on device type.
+
+        A Desktop (Mobile) device counts its own column first and falls back to
+        the other column; any other device counts a match in both columns once.
+        """
+        is_desktop, is_mobile = self._device_masks(df)
+        other = ~(is_desktop | is_mobile)
+
+        both_count = int((other & desktop_mask & mobile_mask).sum())
+        desktop_count = int(
+            ((other | is_mobile) & desktop_mask & ~mobile_mask).sum() + (is_desktop & desktop_mask).sum()
+        )
+        mobile_count = int(
+            ((other | is_desktop) & mobile_mask & ~desktop_mask).sum() + (is_mobile & mobile_mask).sum()
+        )
 
         return {
             "desktop": desktop_count,
@@ -102,26 +154,15 @@ class AutomationDataProcessor:
             "total": desktop_count + mobile_count + both_count,
         }
 
-    def _count_by_device_simple(self, df: pd.DataFrame, mask: pd.Series) -> Dict[str, int]:
+    def _count_by_device_simple(self, df: Frame, mask: Mask) -> Dict[str, int]:
         """Simple pivot-style count by device (no cross-column deduplication)."""
-        if self.DEVICE_COL not in df.columns:
+        if not self._backend.has_column(df, self.DEVICE_COL):
             return {"desktop": 0, "mobile": 0, "both": 0, "total": int(mask.sum())}
 
-        desktop_count = mobile_count = both_count = 0
-
-        for i in range(len(df)):
-            if not mask.iloc[i]:
-                continue
-
-            device = self._get_device_value(df, i)
-            if device == "Both":
-                both_count += 1
-            elif device == "Desktop":
-                desktop_count += 1
-            elif device == "Mobile":
-                mobile_count += 1
-            else:
-                both_count += 1
+        is_desktop, is_mobile = self._device_masks(df)
+        desktop_count = int((mask & is_desktop).sum())
+        mobile_count = int((mask & is_mobile).sum())
+        both_count = int(mask.sum()) - desktop_count - mobile_count
 
         return {
             "desktop": desktop_count,
@@ -138,8 +179,8 @@ class AutomationDataProcessor:
         desktop_status = self._normalize_column(self._baseline_df, self.DESKTOP_COL)
         mobile_status = self._normalize_column(self._baseline_df, self.MOBILE_COL)
 
-        desktop_count = int(desktop_status.isin(self.AUTOMATED_STATUSES).sum())
-        mobile_count = int(mobile_status.isin(self.AUTOMATED_STATUSES).sum())
+        desktop_count = int(self._backend.isin(desktop_status, self.AUTOMATED_STATUSES).sum())
+        mobile_count = int(self._backend.isin(mobile_status, self.AUTOMATED_STATUSES).sum())
 
         return {
             "desktop": desktop_count,
@@ -155,8 +196,8 @@ class AutomationDataProcessor:
         desktop_status = self._normalize_column(self._plan_df, self.DESKTOP_COL)
         mobile_status = self._normalize_column(self._plan_df, self.MOBILE_COL)
 
-        desktop_mask = desktop_status.isin(self.BACKLOG_STATUSES)
-        mobile_mask = mobile_status.isin(self.BACKLOG_STATUSES)
+        desktop_mask = self._backend.isin(desktop_status, self.BACKLOG_STATUSES)
+        mobile_mask = self._backend.isin(mobile_status, self.BACKLOG_STATUSES)
 
         result = self._count_by_device_smart(self._plan_df, desktop_mask, mobile_mask)
         return {
@@ -174,25 +215,20 @@ class AutomationDataProcessor:
         desktop_status = self._normalize_column(self._plan_df, self.DESKTOP_COL)
         mobile_status = self._normalize_column(self._plan_df, self.MOBILE_COL)
 
-        blocked_mask = (desktop_status == self.BLOCKED_STATUS) | (mobile_status == self.BLOCKED_STATUS)
+        blocked_mask = self._backend.equals(desktop_status, self.BLOCKED_STATUS) | self._backend.equals(
+            mobile_status, self.BLOCKED_STATUS
+        )
         return int(blocked_mask.sum())
 
-    def _calculate_in_review(self) -> Dict[str, int]:
+    def _calculate_in_review(self, sections: Optional[Tuple] = None) -> Dict[str, int]:
         """Calculate tests in review (Status = 'Passed with issue') from plan."""
-        if self._plan_df is None or self.STATUS_COL not in self._plan_df.columns:
+        if self._plan_df is None or not self._backend.has_column(self._plan_df, self.STATUS_COL):
             return {"desktop": 0, "mobile": 0, "total": 0}
 
-        plan_desktop, plan_mobile = self._split_plan_by_empty_row()
-
-        desktop_count = 0
-        if plan_desktop is not None and len(plan_desktop) > 0 and self.STATUS_COL in plan_desktop.columns:
-            status = self._normalize_column(plan_desktop, self.STATUS_COL)
-            desktop_count = int((status == self.IN_REVIEW_STATUS).sum())
+        plan_desktop, plan_mobile = sections if sections is not None else self._split_plan_by_empty_row()
 
-        mobile_count = 0
-        if plan_mobile is not None and len(plan_mobile) > 0 and self.STATUS_COL in plan_mobile.columns:
-            status = self._normalize_column(plan_mobile, self.STATUS_COL)
-            mobile_count = int((status == self.IN_REVIEW_STATUS).sum())
+        desktop_count = self._count_in_review_for_df(plan_desktop)
+        mobile_count = self._count_in_review_for_df(plan_mobile)
 
         return {
             "desktop": desktop_count,
@@ -200,42 +236,43 @@ class AutomationDataProcessor:
             "total": desktop_count + mobile_count,
         }
 
-    def _split_plan_by_empty_row(self) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    def _count_in_review_for_df(self, df: Optional[Frame]) -> int:
+        """Count 'Passed with issue' rows in one plan section."""
+        if df is None or self._backend.num_rows(df) == 0 or not self._backend.has_column(df, self.STATUS_COL):
+            return 0
+        status = self._normalize_column(df, self.STATUS_COL)
+        return int(self._backend.equals(status, self.IN_REVIEW_STATUS).sum())
+
+    def _split_plan_by_empty_row(self) -> Tuple[Optional[Frame], Optional[Frame]]:
         """Split plan dataframe into Desktop and Mobile sections by empty row."""
         if self._plan_df is None:
             return None, None
 
-        if self.ID_COL not in self._plan_df.columns:
-            return self._plan_df, pd.DataFrame()
-
-        empty_rows = self._plan_df[self._plan_df[self.ID_COL].isna()].index
-        if len(empty_rows) == 0:
-            return self._plan_df, pd.DataFrame()
+        if not self._backend.has_column(self._plan_df, self.ID_COL):
+            return self._plan_df, self._backend.empty()
 
-        split_idx = empty_rows[0]
-        plan_desktop = self._plan_df.iloc[:split_idx].copy()
-        plan_mobile = self._plan_df.iloc[split_idx + 1 :].copy().reset_index(drop=True)
+        return self._backend.split_at_first_null(self._plan_df, self.ID_COL)
 
-        return plan_desktop, plan_mobile
-
-    def _calculate_not_applicable_for_df(
-        self, df: Optional[pd.DataFrame], status_col: str
-    ) -> Dict[str, int]:
+    def _calculate_not_applicable_for_df(self, df: Optional[Frame], status_col: str) -> Dict[str, int]:
         """Calculate not applicable for a specific dataframe and status column."""
-        if df is None or len(df) == 0:
+        if df is None or self._backend.num_rows(df) == 0:
             return {"desktop": 0, "mobile": 0, "both": 0, "total": 0}
 
         status = self._normalize_column(df, status_col)
-        mask = status == self.NA_STATUS
+        mask = self._backend.equals(status, self.NA_STATUS)
         return self._count_by_device_simple(df, mask)
 
-    def _calculate_not_applicable_detailed(self) -> Dict:
+    def _calculate_not_applicable_detailed(self, sections: Optional[Tuple] = None) -> Dict:
         """Calculate not applicable with Plan Desktop and Plan Mobile breakdown."""
-        plan_desktop, plan_mobile = self._split_plan_by_empty_row()
+        plan_desktop, plan_mobile = sections if sections is not None else self._split_plan_by_empty_row()
 
         na_plan_desktop = self._calculate_not_applicable_for_df(plan_desktop, self.DESKTOP_COL)
         na_plan_mobile = self._calculate_not_applicable_for_df(plan_mobile, self.MOBILE_COL)
+        return self._combine_not_applicable(na_plan_desktop, na_plan_mobile)
 
+    @staticmethod
+    def _combine_not_applicable(na_plan_desktop: Dict[str, int], na_plan_mobile: Dict[str, int]) -> Dict:
+        """Combine Plan Desktop and Plan Mobile NA counts with their armonic totals."""
         armonic = {
             "desktop": max(na_plan_desktop["desktop"], na_plan_mobile["desktop"]),
             "mobile": max(na_plan_desktop["mobile"], na_plan_mobile["mobile"]),
@@ -249,26 +286,40 @@ class AutomationDataProcessor:
             "armonic": armonic,
         }
 
-    def _calculate_not_applicable(self) -> Dict[str, int]:
+    def _calculate_not_applicable(self, detailed: Optional[Dict] = None) -> Dict[str, int]:
         """Calculate not applicable tests (returns armonic totals)."""
-        detailed = self._calculate_not_applicable_detailed()
+        if detailed is None:
+            detailed = self._calculate_not_applicable_detailed()
         return detailed["armonic"].copy()
 
-    def _count_reasons_for_df(self, df: Optional[pd.DataFrame], status_col: str) -> Dict[str, int]:
-        """Count NA reasons for a specific dataframe."""
-        if df is None or len(df) == 0 or self.NA_REASON_COL not in df.columns:
+    def _count_reasons_for_df(self, df: Optional[Frame], status_col: str) -> Dict[str, int]:
+        """Count NA reasons for a specific dataframe, most frequent first."""
+        return self._sort_reasons(self._tally_reasons_for_df(df, status_col))
+
+    @staticmethod
+    def _sort_reasons(reasons_count: Dict[str, int]) -> Dict[str, int]:
+        """Order reason counts by frequency, ties in first-seen order."""
+        return dict(sorted(reasons_count.items(), key=lambda x: x[1], reverse=True))
+
+    def _tally_reasons_for_df(self, df: Optional[Frame], status_col: str) -> Dict[str, int]:
+        """Count NA reasons for a specific dataframe, in first-seen order."""
+        if (
+            df is None
+            or self._backend.num_rows(df) == 0
+            or not self._backend.has_column(df, self.NA_REASON_COL)
+        ):
             return {}
 
         status = self._normalize_column(df, status_col)
-        na_mask = status == self.NA_STATUS
-        na_tests = df[na_mask]
+        na_mask = self._backend.equals(status, self.NA_STATUS)
+        na_tests = self._backend.filter(df, na_mask)
 
-        if len(na_tests) == 0:
+        if self._backend.num_rows(na_tests) == 0:
             return {}
 
         reasons_count: Dict[str, int] = {}
-        for reason_raw in na_tests[self.NA_REASON_COL]:
-            if pd.isna(reason_raw) or str(reason_raw).strip() == "":
+        for reason_raw in self._backend.to_list(na_tests, self.NA_REASON_COL):
+            if reason_raw is None or str(reason_raw).strip() == "":
                 reasons_count["No reason specified"] = reasons_count.get("No reason specified", 0) + 1
             else:
                 for reason in str(reason_raw).strip().split("\n"):
@@ -276,28 +327,192 @@ class AutomationDataProcessor:
                     if reason:
                         reasons_count[reason] = reasons_count.get(reason, 0) + 1
 
-        return dict(sorted(reasons_count.items(), key=lambda x: x[1], reverse=True))
+        return reasons_count
 
-    def _calculate_na_reasons(self) -> Dict:
+    def _calculate_na_reasons(self, sections: Optional[Tuple] = None) -> Dict:
         """Calculate breakdown of Not Applicable reasons for Desktop and Mobile."""
-        plan_desktop, plan_mobile = self._split_plan_by_empty_row()
+        plan_desktop, plan_mobile = sections if sections is not None else self._split_plan_by_empty_row()
 
         return {
             "desktop": self._count_reasons_for_df(plan_desktop, self.DESKTOP_COL),
             "mobile": self._count_reasons_for_df(plan_mobile, self.MOBILE_COL),
         }
 
-    def get_all_metrics(self) -> Optional[Dict]:
-        """Calculate all metrics in one call."""
-        if not self._load_data():
-            return None
+    def _section_partial(self, df: Optional[Frame], status_col: str) -> Dict:
+        """In-review, NA and first-seen NA-reason counts for rows of one plan section."""
+        return {
+            "in_review": self._count_in_review_for_df(df),
+            "not_applicable": self._calculate_not_applicable_for_df(df, status_col),
+            "na_reasons": self._tally_reasons_for_df(df, status_col),
+        }
+
+    def plan_partials(self, stream: BinaryIO, mobile: bool = False) -> Dict:
+        """Partial plan metrics over one shard of the plan CSV (header plus whole rows).
+
+        Backlog and blocked counts cover every row. Section counts treat the
+        shard as Mobile, or as Desktop up to its first empty-ID row (the
+        separator, which only the last Desktop shard contains).
+        """
+        self._plan_df = self._backend.read_csv(stream, None)
+        if mobile:
+            section = self._section_partial(self._plan_df, self.MOBILE_COL)
+        else:
+            section = self._section_partial(self._split_plan_by_empty_row()[0], self.DESKTOP_COL)
 
         return {
-            "automated": self._calculate_automated(),
             "backlog": self._calculate_backlog(),
             "blocked": self._calculate_blocked(),
-            "in_review": self._calculate_in_review(),
-            "not_applicable": self._calculate_not_applicable(),
-            "not_applicable_detailed": self._calculate_not_applicable_detailed(),
-            "na_reasons": self._calculate_na_reasons(),
+            "has_status": self._backend.has_column(self._plan_df, self.STATUS_COL),
+            "mobile": mobile,
+            "section": section,
         }
+
+    def metrics(self, backend: Optional[str] = None) -> "LazyMetrics":
+        """Return a lazy view of the metrics, each computed on first access.
+
+        ``backend`` overrides the processor's compute backend for this view.
+        """
+        processor = copy.copy(self)
+        processor._baseline_df = processor._plan_df = None
+        if backend is not None and backend != self._backend.name:
+            processor._backend = get_backend(backend)
+        return LazyMetrics(processor)
+
+    def get_all_metrics(self, backend: Optional[str] = None) -> Optional[Dict]:
+        """Calculate all metrics in one call.
+
+        ``backend`` overrides the processor's compute backend for this call.
+        """
+        metrics = self.metrics(backend)
+        if not metrics.load("baseline", "plan"):
+            return None
+        return dict(metrics)
+
+
+# Metric name -> (calculation method, source files, metric dependencies).
+# Dependency results are passed to the calculation method positionally.
+METRIC_GRAPH: Dict[str, Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = {
+    "automated": ("_calculate_automated", ("baseline",), ()),
+    "backlog": ("_calculate_backlog", ("plan",), ()),
+    "blocked": ("_calculate_blocked", ("plan",), ()),
+    "plan_sections": ("_split_plan_by_empty_row", ("plan",), ()),
+    "in_review": ("_calculate_in_review", ("plan",), ("plan_sections",)),
+    "not_applicable_detailed": ("_calculate_not_applicable_detailed", ("plan",), ("plan_sections",)),
+    "not_applicable": ("_calculate_not_applicable", (), ("not_applicable_detailed",)),
+    "na_reasons": ("_calculate_na_reasons", ("plan",), ("plan_sections",)),
+}
+
+# Public metrics, in get_all_metrics() order
+METRIC_NAMES = (
+    "automated",
+    "backlog",
+    "blocked",
+    "in_review",
+    "not_applicable",
+    "not_applicable_detailed",
+    "na_reasons",
+)
+
+SOURCE_LOADERS = {"baseline": "_load_baseline", "plan": "_load_plan"}
+
+
+class LazyMetrics(Mapping[str, Any]):
+    """Read-only mapping of metrics evaluated on demand and memoized.
+
+    Accessing a metric loads only the source files it depends on; a metric
+    whose file cannot be loaded evaluates to None.
+    """
+
+    def __init__(self, processor: AutomationDataProcessor) -> None:
+        """Initialize with a processor owned by this view."""
+        self._processor = processor
+        self._loaded: Dict[str, bool] = {}
+        self._values: Dict[str, Any] = {}
+
+    def load(self, *sources: str) -> bool:
+        """Load the given source files ('baseline', 'plan') once each."""
+        for source in sources:
+            if source not in self._loaded:
+                self._loaded[source] = getattr(self._processor, SOURCE_LOADERS[source])()
+            if not self._loaded[source]:
+                return False
+        return True
+
+    def is_evaluated(self, name: str) -> bool:
+        """Return whether a metric has already been computed."""
+        return name in self._values
+
+    def _resolve(self, name: str) -> Any:
+        """Compute a graph node after its sources and dependencies."""
+        if name not in self._values:
+            method, sources, dependencies = METRIC_GRAPH[name]
+            value = None
+            if self.load(*sources):
+                args = [self._resolve(dependency) for dependency in dependencies]
+                if all(arg is not None for arg in args):
+                    value = getattr(self._processor, method)(*args)
+            self._values[name] = value
+        return self._values[name]
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in METRIC_NAMES:
+            raise KeyError(name)
+        return self._resolve(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in METRIC_NAMES
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(METRIC_NAMES)
+
+    def __len__(self) -> int:
+        return len(METRIC_NAMES)
+
+
+def calculate_na_ratio(metrics: Mapping[str, Any]) -> float:
+    """Armonic NA as a percentage of automated plus armonic NA tests."""
+    auto_total = metrics["automated"]["total"]
+    armonic_na = metrics["not_applicable_detailed"]["armonic"]["total"]
+    total_completed = auto_total + armonic_na
+    return (armonic_na / total_completed * 100) if total_completed > 0 else 0.0
+
+
+def calculate_coverage(metrics: Mapping[str, Any]) -> float:
+    """Automated tests as a percentage of applicable (non-NA) tests."""
+    in_review = metrics.get("in_review", {"desktop": 0, "mobile": 0, "total": 0})
+    in_review_total = in_review["total"] if isinstance(in_review, dict) else in_review
+    auto_total = metrics["automated"]["total"]
+    applicable = auto_total + metrics["backlog"]["smart_total"] + in_review_total + metrics["blocked"]
+    return (auto_total / applicable * 100) if applicable > 0 else 0.0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print the requested metrics as JSON, loading only the files they need."""
+    parser = argparse.ArgumentParser(description="Compute Watsons Turkey automation metrics.")
+    parser.add_argument("--baseline", default="", help="baseline CSV (plain or compressed)")
+    parser.add_argument("--plan", default="", help="plan CSV (plain or compressed)")
+    parser.add_argument(
+        "--metric", action="append", choices=METRIC_NAMES, help="metric to compute (repeatable, default: all)"
+    )
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=sorted(BACKENDS), help="compute backend")
+    parser.add_argument(
+        "--workers", type=int, help="shard the plan across this many processes (computes all metrics)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.workers:
+        from parallel_processor import compute_metrics_parallel
+
+        metrics = compute_metrics_parallel(args.baseline, args.plan, workers=args.workers, backend=args.backend)
+        if metrics is None:
+            return 1
+    else:
+        metrics = AutomationDataProcessor(args.baseline, args.plan, backend=args.backend).metrics()
+    result = {name: metrics[name] for name in args.metric or METRIC_NAMES}
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0 if all(value is not None for value in result.values()) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""OpenMetrics / Prometheus exporter for Watsons Turkey Automation Dashboard.
+
+Exposes the latest computed KPIs as gauges, per-stage processing latency
+histograms and cache hit/miss counters on ``/metrics``. KPI samples are
+rendered once when metrics are updated, so scrapes only read the cached
+snapshot and never trigger recomputation.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from data_processor import NA_RATIO_THRESHOLD, calculate_coverage, calculate_na_ratio
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "watsons"
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# One sample: (labels, value)
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition formats."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Mapping[str, str]) -> str:
+    """Label set as {key="value",...}, or empty for no labels."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Sample value: integers without a fraction, floats in full precision."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_bound(bound: float) -> str:
+    """Histogram bucket bound as a float ('1.0', '+Inf')."""
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def _breakdown(
+    name: str, help_text: str, values: Mapping[str, int], keys: Tuple[str, ...]
+) -> Tuple[str, str, List[Sample]]:
+    """Gauge family with one sample per platform key."""
+    return (name, help_text, [({"platform": key}, values[key]) for key in keys])
+
+
+def kpi_families(metrics: Mapping[str, Any]) -> List[Tuple[str, str, List[Sample]]]:
+    """Gauge families (name, help, samples) for a get_all_metrics() result."""
+    in_review = metrics["in_review"]
+    if isinstance(in_review, int):
+        in_review = {"desktop": 0, "mobile": 0, "total": in_review}
+    backlog = dict(metrics["backlog"], total=metrics["backlog"]["smart_total"])
+
+    return [
+        _breakdown(
+            "automated_tests", "Automated test cases in the baseline.",
+            metrics["automated"], ("desktop", "mobile", "total"),
+        ),
+        _breakdown(
+            "backlog_tests", "Backlog test cases with smart deduplication.",
+            backlog, ("desktop", "mobile", "both", "total"),
+        ),
+        ("blocked_tests", "Blocked test cases in the plan.", [({}, metrics["blocked"])]),
+        _breakdown(
+            "in_review_tests", "Plan tests with status 'Passed with issue'.",
+            in_review, ("desktop", "mobile", "total"),
+        ),
+        _breakdown(
+            "not_applicable_tests", "Test cases not applicable for automation (armonic).",
+            metrics["not_applicable"], ("desktop", "mobile", "both", "total"),
+        ),
+        (
+            "na_ratio", "Armonic NA over automated plus armonic NA tests (0-1).",
+            [({}, calculate_na_ratio(metrics) / 100)],
+        ),
+        ("na_ratio_threshold", "NA ratio threshold (0-1).", [({}, NA_RATIO_THRESHOLD / 100)]),
+        (
+            "automation_coverage_ratio", "Automated over applicable test cases (0-1).",
+            [({}, calculate_coverage(metrics) / 100)],
+        ),
+    ]
+
+
+class MetricsRegistry:
+    """Thread-safe store of KPI gauges, latency histograms and cache counters."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Initialize an empty registry with the given histogram buckets."""
+        self._buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._lock = threading.Lock()
+        self._kpi_text = ""
+        self._histograms: Dict[str, Tuple[List[int], List[float]]] = {}
+        self._cache_counts: Dict[Tuple[str, str], int] = {}
+
+    def update_kpis(self, metrics: Mapping[str, Any]) -> None:
+        """Snapshot KPI gauges from a full metrics result."""
+        lines = []
+        families = kpi_families(metrics)
+        families.append(
+            ("metrics_last_update_timestamp_seconds", "Time the KPI snapshot was taken.", [({}, time.time())])
+        )
+        for name, help_text, samples in families:
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} gauge")
+            for labels, value in samples:
+                lines.append(f"{PREFIX}_{name}{_format_labels(labels)} {_format_value(value)}")
+        with self._lock:
+            self._kpi_text = "\n".join(lines) + "\n"
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record one processing latency for a stage."""
+        with self._lock:
+            counts, total = self._histograms.setdefault(stage, ([0] * len(self._buckets), [0.0]))
+            for i, bound in enumerate(self._buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            total[0] += seconds
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Record the duration of the enclosed block for a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def count_cache(self, cache: str, hits: int = 0, misses: int = 0) -> None:
+        """Add hits and misses for a named cache."""
+        with self._lock:
+            for result, count in (("hits", hits), ("misses", misses)):
+                key = (cache, result)
+                self._cache_counts[key] = self._cache_counts.get(key, 0) + count
+
+    def render(self, openmetrics: bool = True) -> str:
+        """Exposition text in OpenMetrics or Prometheus 0.0.4 format."""
+        name = f"{PREFIX}_processing_duration_seconds"
+        with self._lock:
+            lines = [self._kpi_text.rstrip("\n")] if self._kpi_text else []
+
+            lines.append(f"# HELP {name} Dashboard processing latency by stage.")
+            lines.append(f"# TYPE {name} histogram")
+            for stage, (counts, total) in sorted(self._histograms.items()):
+                for bound, count in zip(self._buckets, counts):
+                    labels = _format_labels({"stage": stage, "le": _format_bound(bound)})
+                    lines.append(f"{name}_bucket{labels} {count}")
+                lines.append(f"{name}_sum{_format_labels({'stage': stage})} {_format_value(total[0])}")
+                lines.append(f"{name}_count{_format_labels({'stage': stage})} {counts[-1]}")
+
+            for result in ("hits", "misses"):
+                family = f"{PREFIX}_cache_{result}"
+                metadata_name = family if openmetrics else f"{family}_total"
+                lines.append(f"# HELP {metadata_name} Cache {result} by cache.")
+                lines.append(f"# TYPE {metadata_name} counter")
+                for (cache, counted), count in sorted(self._cache_counts.items()):
+                    if counted == result:
+                        lines.append(f"{family}_total{_format_labels({'cache': cache})} {count}")
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def start_exporter(
+    port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+) -> Optional[ThreadingHTTPServer]:
+    """Serve ``/metrics`` on a background thread; returns None if the port is unavailable."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = registry.render(openmetrics).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        logger.warning("Metrics exporter not started on port %s: %s", port, e)
+        return None
+
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-exporter").start()
+    logger.info("Metrics exporter listening on %s:%s/metrics", host, port)
+    return server
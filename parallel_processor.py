@@ -0,0 +1,258 @@
+"""Map-reduce processing of a single large plan CSV across CPU cores.
+
+The plan is split into byte-range shards that end on row boundaries (quoted
+multi-line fields such as NA reasons are never cut), with one boundary just
+after the Desktop/Mobile separator row so every shard lies in one section.
+Each worker parses its shard and computes partial counters and NA-reason
+tallies; the partials are merged into the same result as
+``AutomationDataProcessor.get_all_metrics()``.
+"""
+
+import csv
+import io
+import logging
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from compute_backends import DEFAULT_BACKEND, NA_VALUES
+from data_processor import AutomationDataProcessor, detect_compression
+
+logger = logging.getLogger(__name__)
+
+# Read size used while scanning for row boundaries
+SCAN_BLOCK_SIZE = 1 << 20
+
+# Start of a row whose first field reads as missing: empty, or an NA string,
+# optionally quoted (blank lines are skipped by the readers, not rows)
+_NA_FIELD = b"|".join(re.escape(value.encode()) for value in sorted(NA_VALUES, key=len, reverse=True) if value)
+SEPARATOR_ROW = re.compile(
+    rb'\n(?:(?:"(?:' + _NA_FIELD + rb')?"|' + _NA_FIELD + rb")(?:,|\r?\n|\r?\Z)|,)"
+)
+
+
+def _count_quotes(f: BinaryIO, start: int, end: int) -> int:
+    """Number of double quotes in the byte range [start, end)."""
+    f.seek(start)
+    count = 0
+    remaining = end - start
+    while remaining > 0:
+        block = f.read(min(SCAN_BLOCK_SIZE, remaining))
+        if not block:
+            break
+        count += block.count(b'"')
+        remaining -= len(block)
+    return count
+
+
+def _row_end(f: BinaryIO, pos: int, in_quotes: bool) -> int:
+    """Offset just past the first newline at or after pos that is outside quotes."""
+    f.seek(pos)
+    while True:
+        block = f.read(SCAN_BLOCK_SIZE)
+        if not block:
+            return pos
+        start = 0
+        while True:
+            newline = block.find(b"\n", start)
+            if newline < 0:
+                in_quotes ^= block.count(b'"', start) % 2 == 1
+                break
+            in_quotes ^= block.count(b'"', start, newline) % 2 == 1
+            if not in_quotes:
+                return pos + newline + 1
+            start = newline + 1
+        pos += len(block)
+
+
+def plan_columns(path: str) -> List[str]:
+    """Column names from the plan CSV header."""
+    with open(path, "rb") as f:
+        header_end = _row_end(f, 0, False)
+        f.seek(0)
+        header = f.read(header_end)
+    return next(csv.reader([header.decode("utf-8-sig")]), [])
+
+
+def find_separator_end(path: str) -> Optional[int]:
+    """Offset just past the first row whose first field (the ID) is missing.
+
+    Candidate rows are found by pattern; the first one preceded by an even
+    number of double quotes starts a real row rather than a line inside a
+    quoted field. Returns None when the plan has no separator row.
+    """
+    if os.path.getsize(path) == 0:
+        return None
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        header_end = _row_end(f, 0, False)
+        cursor, in_quotes = header_end, False
+        for match in SEPARATOR_ROW.finditer(data, header_end - 1):
+            row_start = match.start() + 1
+            in_quotes ^= _count_quotes(f, cursor, row_start) % 2 == 1
+            cursor = row_start
+            if not in_quotes:
+                return _row_end(f, row_start, False)
+    return None
+
+
+def find_row_boundaries(
+    path: str, shards: int, split_at: Optional[int] = None
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """Return the header length and up to ``shards`` byte ranges of whole rows.
+
+    Assumes RFC 4180 quoting: a newline ends a row only when an even number
+    of double quotes precedes it (escaped quotes come in pairs), so quoted
+    multi-line fields are never cut. ``split_at``, a row boundary, is always
+    one of the range edges.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header_end = _row_end(f, 0, False)
+        step = (size - header_end) / shards
+        edges: List[int] = []
+        cursor, in_quotes = header_end, False
+        for i in range(1, shards):
+            target = max(header_end + int(step * i), cursor)
+            in_quotes ^= _count_quotes(f, cursor, target) % 2 == 1
+            cursor, in_quotes = _row_end(f, target, in_quotes), False
+            if cursor >= size:
+                break
+            edges.append(cursor)
+
+    if split_at is not None and header_end < split_at < size and split_at not in edges:
+        edges = sorted(edges + [split_at])
+
+    starts = [header_end] + edges
+    ends = edges + [size]
+    return header_end, list(zip(starts, ends))
+
+
+def _process_shard(path: str, header_end: int, start: int, end: int, mobile: bool, backend: str) -> Dict:
+    """Worker: compute partial plan metrics for one byte range."""
+    with open(path, "rb") as f:
+        header = f.read(header_end)
+        f.seek(start)
+        body = f.read(end - start)
+
+    processor = AutomationDataProcessor("", "", backend=backend)
+    return processor.plan_partials(io.BytesIO(header + body), mobile)
+
+
+def _process_baseline(path: str, backend: str) -> Optional[Dict[str, int]]:
+    """Worker: compute the baseline-only metrics."""
+    return AutomationDataProcessor(path, "", backend=backend).metrics()["automated"]
+
+
+def _empty_section() -> Dict:
+    """Zeroed section partial."""
+    return {
+        "in_review": 0,
+        "not_applicable": {"desktop": 0, "mobile": 0, "both": 0, "total": 0},
+        "na_reasons": {},
+    }
+
+
+def _merge_section(total: Dict, partial: Dict) -> None:
+    """Add one section partial into a running total, keeping reason first-seen order."""
+    total["in_review"] += partial["in_review"]
+    for key, value in partial["not_applicable"].items():
+        total["not_applicable"][key] += value
+    for reason, count in partial["na_reasons"].items():
+        total["na_reasons"][reason] = total["na_reasons"].get(reason, 0) + count
+
+
+def merge_partials(automated: Dict[str, int], partials: List[Dict]) -> Dict:
+    """Reduce shard partials, in file order, into the get_all_metrics() result."""
+    backlog = {"desktop": 0, "mobile": 0, "both": 0, "smart_total": 0}
+    blocked = 0
+    sections = {"desktop": _empty_section(), "mobile": _empty_section()}
+
+    for partial in partials:
+        for key in backlog:
+            backlog[key] += partial["backlog"][key]
+        blocked += partial["blocked"]
+        _merge_section(sections["mobile" if partial["mobile"] else "desktop"], partial["section"])
+
+    has_status = any(partial["has_status"] for partial in partials)
+    in_review_desktop = sections["desktop"]["in_review"] if has_status else 0
+    in_review_mobile = sections["mobile"]["in_review"] if has_status else 0
+    detailed = AutomationDataProcessor._combine_not_applicable(
+        sections["desktop"]["not_applicable"], sections["mobile"]["not_applicable"]
+    )
+
+    return {
+        "automated": automated,
+        "backlog": backlog,
+        "blocked": blocked,
+        "in_review": {
+            "desktop": in_review_desktop,
+            "mobile": in_review_mobile,
+            "total": in_review_desktop + in_review_mobile,
+        },
+        "not_applicable": detailed["armonic"].copy(),
+        "not_applicable_detailed": detailed,
+        "na_reasons": {
+            "desktop": AutomationDataProcessor._sort_reasons(sections["desktop"]["na_reasons"]),
+            "mobile": AutomationDataProcessor._sort_reasons(sections["mobile"]["na_reasons"]),
+        },
+    }
+
+
+def compute_metrics_parallel(
+    baseline_path: str,
+    plan_path: str,
+    workers: Optional[int] = None,
+    shards: Optional[int] = None,
+    backend: str = DEFAULT_BACKEND,
+) -> Optional[Dict]:
+    """Calculate all metrics with the plan sharded across worker processes.
+
+    Compressed plans cannot be split by byte range, and plans whose ID is not
+    the first column cannot have their separator row located by scanning;
+    both are processed in one piece by ``AutomationDataProcessor.get_all_metrics()``.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = shards or workers
+
+    try:
+        if detect_compression(plan_path) is not None:
+            logger.info("Plan is compressed, processing it without sharding")
+            return AutomationDataProcessor(baseline_path, plan_path, backend=backend).get_all_metrics()
+
+        if os.path.getsize(plan_path) == 0:
+            logger.error("CSV file is empty: %s", plan_path)
+            return None
+
+        columns = plan_columns(plan_path)
+        id_col = AutomationDataProcessor.ID_COL
+        if id_col in columns and columns[0] != id_col:
+            logger.info("Plan ID is not the first column, processing it without sharding")
+            return AutomationDataProcessor(baseline_path, plan_path, backend=backend).get_all_metrics()
+
+        mobile_start = find_separator_end(plan_path) if id_col in columns else None
+        header_end, ranges = find_row_boundaries(plan_path, shards, split_at=mobile_start)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            baseline_future = pool.submit(_process_baseline, baseline_path, backend)
+            shard_futures = [
+                pool.submit(
+                    _process_shard, plan_path, header_end, start, end,
+                    mobile_start is not None and start >= mobile_start, backend,
+                )
+                for start, end in ranges
+            ]
+            automated = baseline_future.result()
+            partials = [future.result() for future in shard_futures]
+
+    except FileNotFoundError as e:
+        logger.error("File not found: %s", e.filename)
+        return None
+    except Exception as e:
+        logger.error("Unexpected error processing shards: %s", e)
+        return None
+
+    if automated is None:
+        return None
+    return merge_partials(automated, partials)
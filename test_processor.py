@@ -1,7 +1,20 @@
 """Test suite for Watsons Turkey Automation Dashboard."""
+import gzip
+import shutil
 import sys
+import tempfile
+import urllib.request
+import zipfile
 from pathlib import Path
+
+import pandas as pd
+
+from compute_backends import BACKENDS, get_backend
 from data_processor import AutomationDataProcessor
+from metrics_exporter import MetricsRegistry, start_exporter
+from parallel_processor import compute_metrics_parallel
+from testrail_client import TestRailClient
+from testrail_mock import PLAN_ID, SUITE_ID, MockTestRailServer
 
 
 def run_tests():
@@ -83,6 +96,164 @@ def run_tests():
         print(f"   Total: {total} | Coverage: {coverage:.1f}%")
     print()
 
+    # Test 6: Compressed inputs
+    print("Test 6: Loading compressed exports...")
+    with tempfile.TemporaryDirectory() as tmp:
+        compressed = {}
+        for path in (baseline_path, plan_path):
+            gz_path = Path(tmp) / f"{path.name}.gz"
+            with open(path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            zip_path = Path(tmp) / f"{path.name}.zip"
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.write(path, path.name)
+            compressed.setdefault(".gz", []).append(str(gz_path))
+            compressed.setdefault(".zip", []).append(str(zip_path))
+
+        for ext, (c_baseline, c_plan) in compressed.items():
+            if AutomationDataProcessor(c_baseline, c_plan).get_all_metrics() != metrics:
+                print(f"   ❌ FAIL: {ext} metrics differ from plain CSV")
+                return False
+            print(f"   ✅ {ext} metrics match plain CSV")
+    print()
+
+    # Test 7: Backend parity
+    print("Test 7: Checking compute backend parity...")
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError as e:
+            print(f"   ⏭️  {name} backend skipped ({e})")
+            continue
+        backend_metrics = AutomationDataProcessor(str(baseline_path), str(plan_path)).get_all_metrics(backend=name)
+        if backend_metrics != metrics:
+            print(f"   ❌ FAIL: {name} backend metrics differ from pandas")
+            return False
+        for section in ("desktop", "mobile"):
+            if list(backend_metrics["na_reasons"][section]) != list(metrics["na_reasons"][section]):
+                print(f"   ❌ FAIL: {name} backend NA reason order differs ({section})")
+                return False
+        print(f"   ✅ {name} backend matches")
+    print()
+
+    # Test 8: Lazy metrics
+    print("Test 8: Checking lazy metric evaluation...")
+    lazy = AutomationDataProcessor(str(baseline_path), str(Path(tempfile.gettempdir()) / "missing.csv")).metrics()
+    if lazy["automated"] != metrics["automated"]:
+        print("   ❌ FAIL: lazy automated differs from get_all_metrics()")
+        return False
+    if lazy["blocked"] is not None:
+        print("   ❌ FAIL: blocked evaluated without a plan file")
+        return False
+    print("   ✅ automated computed from baseline only")
+
+    lazy = AutomationDataProcessor(str(baseline_path), str(plan_path)).metrics()
+    lazy["not_applicable"]
+    if not lazy.is_evaluated("not_applicable_detailed") or lazy.is_evaluated("backlog"):
+        print("   ❌ FAIL: not_applicable did not reuse only its declared dependencies")
+        return False
+    if dict(lazy) != metrics:
+        print("   ❌ FAIL: lazy metrics differ from get_all_metrics()")
+        return False
+    print("   ✅ Dependencies memoized and results match")
+    print()
+
+    # Test 9: TestRail connector against the local mock server
+    print("Test 9: Fetching from mock TestRail API...")
+    server = MockTestRailServer.from_frames(pd.read_csv(baseline_path), pd.read_csv(plan_path))
+    with server, TestRailClient(server.url, "user", "key", page_size=50, max_workers=4) as client:
+        if client.processor(SUITE_ID, PLAN_ID).get_all_metrics() != metrics:
+            print("   ❌ FAIL: TestRail metrics differ from CSV metrics")
+            return False
+        print("   ✅ TestRail rows match CSV metrics")
+
+        first_requests = client.requests_sent
+        client.processor(SUITE_ID, PLAN_ID).get_all_metrics()
+        if client.not_modified != client.requests_sent - first_requests:
+            print("   ❌ FAIL: unchanged pages were downloaded again")
+            return False
+        print(f"   ✅ Refetch served {client.not_modified} unchanged pages from cache")
+
+    # Fields with per-project contexts and duplicate labels
+    server = MockTestRailServer.from_frames(pd.read_csv(baseline_path), pd.read_csv(plan_path))
+    server.add_project(2)
+    with server, TestRailClient(server.url, "user", "key", page_size=50, max_workers=4) as client:
+        if client.processor(SUITE_ID, PLAN_ID).get_all_metrics() != metrics:
+            print("   ❌ FAIL: other project contexts change TestRail metrics")
+            return False
+        print("   ✅ Option ids resolved for the plan's project only")
+    print()
+
+    # Test 10: Sharded plan processing
+    print("Test 10: Checking sharded plan processing...")
+    for shards in (1, 2, 3, 7, 16):
+        sharded = compute_metrics_parallel(str(baseline_path), str(plan_path), workers=2, shards=shards)
+        if sharded != metrics:
+            print(f"   ❌ FAIL: {shards} shards differ from get_all_metrics()")
+            return False
+        for section in ("desktop", "mobile"):
+            if list(sharded["na_reasons"][section]) != list(metrics["na_reasons"][section]):
+                print(f"   ❌ FAIL: {shards} shards change NA reason order ({section})")
+                return False
+    print("   ✅ Sharded results match for 1-16 shards")
+
+    # A second empty-ID row after the separator still belongs to Mobile
+    plan_df = pd.read_csv(plan_path)
+    extra_row = {col: None for col in plan_df.columns}
+    extra_row.update({
+        AutomationDataProcessor.MOBILE_COL: "Automation not applicable",
+        AutomationDataProcessor.NA_REASON_COL: "Lost reason",
+        AutomationDataProcessor.STATUS_COL: "Passed with issue",
+    })
+    insert_at = len(plan_df) * 9 // 10
+    plan_df = pd.concat(
+        [plan_df.iloc[:insert_at], pd.DataFrame([extra_row]), plan_df.iloc[insert_at:]], ignore_index=True
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        extra_plan = str(Path(tmp) / "plan_extra_empty_id.csv")
+        plan_df.to_csv(extra_plan, index=False)
+        expected = AutomationDataProcessor(str(baseline_path), extra_plan).get_all_metrics()
+        if "Lost reason" not in expected["na_reasons"]["mobile"]:
+            print("   ❌ FAIL: test plan lacks a second empty-ID row in Mobile")
+            return False
+        for shards in (1, 2, 4, 8):
+            if compute_metrics_parallel(str(baseline_path), extra_plan, workers=2, shards=shards) != expected:
+                print(f"   ❌ FAIL: {shards} shards drop an empty-ID row after the separator")
+                return False
+    print("   ✅ Empty-ID rows after the separator are counted as Mobile")
+    print()
+
+    # Test 11: Metrics exporter
+    print("Test 11: Scraping the metrics endpoint...")
+    registry = MetricsRegistry()
+    registry.update_kpis(metrics)
+    registry.observe("load_plan", 0.2)
+    registry.count_cache("testrail_etag", hits=3, misses=1)
+    server = start_exporter(0, host="127.0.0.1", registry=registry)
+    if server is None:
+        print("   ❌ FAIL: exporter did not start")
+        return False
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        request = urllib.request.Request(url, headers={"Accept": "application/openmetrics-text"})
+        with urllib.request.urlopen(request) as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    expected = [
+        f'watsons_automated_tests{{platform="total"}} {metrics["automated"]["total"]}',
+        f"watsons_blocked_tests {metrics['blocked']}",
+        'watsons_processing_duration_seconds_bucket{stage="load_plan",le="0.25"} 1',
+        'watsons_cache_hits_total{cache="testrail_etag"} 3',
+    ]
+    missing = [line for line in expected if line not in body.splitlines()]
+    if missing or not body.endswith("# EOF\n"):
+        print(f"   ❌ FAIL: scrape is missing {missing or ['# EOF']}")
+        return False
+    print(f"   ✅ Scrape returned {len(body.splitlines())} lines of OpenMetrics text")
+    print()
+
     print("=" * 60)
     print("ALL TESTS PASSED ✅")
     print("=" * 60)
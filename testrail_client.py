@@ -0,0 +1,254 @@
+"""TestRail API connector for Watsons Turkey Automation Dashboard.
+
+Pulls baseline-suite cases and plan tests straight from the TestRail API v2
+and turns them into rows keyed by CSV export column, ready for
+``AutomationDataProcessor.from_records`` - no CSV download step.
+"""
+
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from compute_backends import DEFAULT_BACKEND, Record
+from data_processor import AutomationDataProcessor
+
+logger = logging.getLogger(__name__)
+
+# TestRail custom field types whose values are option ids
+DROPDOWN_TYPE = 6
+MULTI_SELECT_TYPE = 12
+
+# Threads that may call the client at once besides its page workers
+# (the dashboard fetches baseline and plan concurrently)
+CALLER_THREADS = 2
+
+# Standard (non-custom) fields exported under a CSV column name
+SYSTEM_FIELD_LABELS = {"title": "Title"}
+
+
+class TestRailClient:
+    """Pooled, concurrent TestRail API client with conditional page requests.
+
+    Every GET carries the ETag of the last response for the same URL, so pages
+    the server reports as unchanged (304) are served from the local cache.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(
+        self,
+        base_url: str,
+        user: str,
+        api_key: str,
+        page_size: int = 250,
+        max_workers: int = 8,
+        timeout: float = 30.0,
+        pool_size: Optional[int] = None,
+    ) -> None:
+        """Initialize client for a TestRail instance (e.g. https://x.testrail.io).
+
+        The connection pool holds ``pool_size`` connections, by default one
+        per page worker plus CALLER_THREADS for first-page requests.
+        """
+        self._api_url = base_url.rstrip("/") + "/index.php?/api/v2/"
+        self._page_size = page_size
+        self._max_workers = max_workers
+        self._timeout = timeout
+
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size or max_workers + CALLER_THREADS, max_retries=retry
+        )
+        self._session = requests.Session()
+        self._session.auth = (user, api_key)
+        self._session.headers["Content-Type"] = "application/json"
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="testrail")
+
+        self._lock = threading.Lock()
+        self._etag_cache: Dict[str, Tuple[str, Any]] = {}
+        self._fields: Dict[int, Dict[str, Tuple[str, int, Dict[int, str]]]] = {}
+        self._statuses: Optional[Dict[int, str]] = None
+        self.requests_sent = 0
+        self.not_modified = 0
+
+    def close(self) -> None:
+        """Release pooled connections and worker threads."""
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def __enter__(self) -> "TestRailClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get(self, endpoint: str) -> Any:
+        """GET an API endpoint, reusing the cached payload when unchanged."""
+        url = self._api_url + endpoint
+        with self._lock:
+            cached = self._etag_cache.get(url)
+            self.requests_sent += 1
+
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        response = self._session.get(url, headers=headers, timeout=self._timeout)
+
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self.not_modified += 1
+            return cached[1]
+
+        response.raise_for_status()
+        payload = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._lock:
+                self._etag_cache[url] = (etag, payload)
+        return payload
+
+    def _page(self, endpoint: str, offset: int) -> Any:
+        """GET one page of a paginated endpoint."""
+        return self._get(f"{endpoint}&limit={self._page_size}&offset={offset}")
+
+    def _get_paginated(self, endpoint: str, key: str) -> List[Dict]:
+        """GET every page of a paginated endpoint, fetching pages concurrently.
+
+        After the first page, the next ``max_workers`` pages are requested at
+        once until a page without a next link is reached.
+        """
+        first = self._page(endpoint, 0)
+        if isinstance(first, list):  # TestRail < 6.7 returns unpaginated lists
+            return first
+
+        items = list(first[key])
+        offset = self._page_size
+        has_next = bool(first["_links"]["next"])
+        while has_next:
+            offsets = [offset + i * self._page_size for i in range(self._max_workers)]
+            for page in self._executor.map(lambda o: self._page(endpoint, o), offsets):
+                if not has_next:
+                    break
+                items.extend(page[key])
+                has_next = bool(page["_links"]["next"])
+            offset = offsets[-1] + self._page_size
+        return items
+
+    def _get_fields(self, project_id: int) -> Dict[str, Tuple[str, int, Dict[int, str]]]:
+        """Custom case fields of a project: system name -> (label, type id, option labels).
+
+        Only the field config whose context is global or lists the project is
+        used, so option ids of other projects' contexts never leak in.
+        """
+        if project_id not in self._fields:
+            fields = {}
+            for field in self._get("get_case_fields"):
+                config = next(
+                    (config for config in field.get("configs") or [] if _applies_to(config, project_id)), None
+                )
+                if config is None:
+                    continue
+                options: Dict[int, str] = {}
+                for item in ((config.get("options") or {}).get("items") or "").splitlines():
+                    option_id, _, label = item.partition(",")
+                    if option_id.strip().isdigit():
+                        options[int(option_id)] = label.strip()
+                fields[field["system_name"]] = (field["label"], field["type_id"], options)
+            self._fields[project_id] = fields
+        return self._fields[project_id]
+
+    def _get_statuses(self) -> Dict[int, str]:
+        """Test status id -> label."""
+        if self._statuses is None:
+            self._statuses = {status["id"]: status["label"] for status in self._get("get_statuses")}
+        return self._statuses
+
+    def _to_row(self, item: Dict[str, Any], row_id: str, project_id: int) -> Record:
+        """Convert an API case/test object to a row keyed by CSV column name.
+
+        Fields the item does not carry are skipped, and an empty value never
+        replaces one already set by another field with the same label.
+        """
+        row: Record = {AutomationDataProcessor.ID_COL: row_id}
+        for name, label in SYSTEM_FIELD_LABELS.items():
+            if name in item:
+                row[label] = item[name]
+
+        for name, (label, type_id, options) in self._get_fields(project_id).items():
+            if name not in item:
+                continue
+            value = item[name]
+            if value is None or value == []:
+                value = None
+            elif type_id == DROPDOWN_TYPE:
+                value = options.get(value)
+            elif type_id == MULTI_SELECT_TYPE:
+                value = "\n".join(options[v] for v in value if v in options) or None
+            if value is not None or row.get(label) is None:
+                row[label] = value
+
+        if "status_id" in item:
+            row[AutomationDataProcessor.STATUS_COL] = self._get_statuses().get(item["status_id"])
+        return row
+
+    def fetch_baseline_rows(self, suite_id: int) -> List[Record]:
+        """Rows for every case in the baseline suite."""
+        project_id = self._get(f"get_suite/{suite_id}")["project_id"]
+        cases = self._get_paginated(f"get_cases/{project_id}&suite_id={suite_id}", "cases")
+        logger.info("Fetched %d cases from suite %s", len(cases), suite_id)
+        return [self._to_row(case, f"C{case['id']}", project_id) for case in cases]
+
+    def fetch_plan_rows(self, plan_id: int) -> List[Record]:
+        """Rows for every test in the plan, laid out like the CSV export.
+
+        Desktop runs come first, then an empty row, then Mobile runs (runs
+        whose configuration or name mentions 'mobile').
+        """
+        plan = self._get(f"get_plan/{plan_id}")
+        project_id = plan["project_id"]
+        desktop_rows: List[Record] = []
+        mobile_rows: List[Record] = []
+        for entry in plan.get("entries", []):
+            for run in entry.get("runs", []):
+                tests = self._get_paginated(f"get_tests/{run['id']}", "tests")
+                rows = [self._to_row(test, f"T{test['id']}", project_id) for test in tests]
+                run_label = f"{run.get('config') or ''} {run.get('name') or ''}".lower()
+                (mobile_rows if "mobile" in run_label else desktop_rows).extend(rows)
+
+        logger.info(
+            "Fetched %d desktop and %d mobile tests from plan %s", len(desktop_rows), len(mobile_rows), plan_id
+        )
+        if not mobile_rows:
+            return desktop_rows
+        return desktop_rows + [{}] + mobile_rows
+
+    def processor(
+        self, suite_id: int, plan_id: int, backend: str = DEFAULT_BACKEND
+    ) -> AutomationDataProcessor:
+        """AutomationDataProcessor over the baseline suite and plan.
+
+        Each side is fetched when a metric first needs it, so e.g. the
+        automated count never downloads the plan.
+        """
+        return AutomationDataProcessor.from_records(
+            functools.partial(self.fetch_baseline_rows, suite_id),
+            functools.partial(self.fetch_plan_rows, plan_id),
+            backend=backend,
+        )
+
+
+def _applies_to(config: Dict[str, Any], project_id: int) -> bool:
+    """Whether a case field config's context covers the project."""
+    context = config.get("context") or {}
+    return bool(context.get("is_global")) or project_id in (context.get("project_ids") or [])
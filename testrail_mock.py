@@ -0,0 +1,284 @@
+"""Local mock TestRail API server for offline testing of the TestRail connector.
+
+Serves the subset of API v2 the connector uses (suites, cases, case fields,
+statuses, plans, tests) with offset/limit pagination and ETag-based
+conditional responses. ``MockTestRailServer.from_frames`` seeds it from
+baseline and plan dataframes in the CSV export layout.
+"""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from data_processor import AutomationDataProcessor
+
+# CSV columns exported as TestRail dropdown / multi-select custom fields
+DROPDOWN_COLUMNS = (
+    AutomationDataProcessor.DESKTOP_COL,
+    AutomationDataProcessor.MOBILE_COL,
+    AutomationDataProcessor.DEVICE_COL,
+)
+MULTI_SELECT_COLUMNS = (AutomationDataProcessor.NA_REASON_COL,)
+
+PROJECT_ID = 1
+SUITE_ID = 7544
+PLAN_ID = 61979
+DESKTOP_RUN_ID = 100
+MOBILE_RUN_ID = 101
+
+
+class MockTestRailServer:
+    """Threaded HTTP server answering TestRail API v2 requests from memory."""
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(
+        self,
+        case_fields: List[Dict],
+        statuses: List[Dict],
+        cases: List[Dict],
+        plan: Dict,
+        tests: Dict[int, List[Dict]],
+    ) -> None:
+        """Initialize with API objects; tests are keyed by run id."""
+        self.case_fields = case_fields
+        self.statuses = statuses
+        self.cases = cases
+        self.plan = plan
+        self.tests = tests
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to TestRailClient."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockTestRailServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockTestRailServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _paginate(self, items: List[Dict], key: str, endpoint: str, params: Dict[str, str]) -> Dict:
+        """Wrap a slice of items in TestRail's pagination envelope."""
+        limit = int(params.get("limit", 250))
+        offset = int(params.get("offset", 0))
+        page = items[offset : offset + limit]
+        next_link = None
+        if offset + limit < len(items):
+            next_link = f"/api/v2/{endpoint}&limit={limit}&offset={offset + limit}"
+        return {
+            "offset": offset,
+            "limit": limit,
+            "size": len(page),
+            "_links": {"next": next_link, "prev": None},
+            key: page,
+        }
+
+    def respond(self, endpoint: str, params: Dict[str, str]) -> Optional[Any]:
+        """Payload for an API endpoint, or None if it is unknown."""
+        name, _, arg = endpoint.partition("/")
+        if name == "get_case_fields":
+            return self.case_fields
+        if name == "get_statuses":
+            return self.statuses
+        if name == "get_suite" and arg == str(SUITE_ID):
+            return {"id": SUITE_ID, "project_id": PROJECT_ID}
+        if name == "get_cases" and arg == str(PROJECT_ID) and params.get("suite_id") == str(SUITE_ID):
+            return self._paginate(self.cases, "cases", f"{endpoint}&suite_id={SUITE_ID}", params)
+        if name == "get_plan" and arg == str(self.plan["id"]):
+            return self.plan
+        if name == "get_tests" and arg.isdigit() and int(arg) in self.tests:
+            return self._paginate(self.tests[int(arg)], "tests", endpoint, params)
+        return None
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                with server._lock:
+                    server.requests += 1
+
+                if "Authorization" not in self.headers:
+                    self._send(401, {"error": "Authentication failed"})
+                    return
+
+                _, _, query = self.path.partition("?/api/v2/")
+                endpoint, *pairs = query.split("&")
+                params = dict(pair.partition("=")[::2] for pair in pairs)
+                payload = server.respond(endpoint, params)
+                if payload is None:
+                    self._send(400, {"error": f"Unknown endpoint {endpoint}"})
+                    return
+
+                body = json.dumps(payload).encode()
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self._send(200, payload, body, etag)
+
+            def _send(self, status: int, payload: Any, body: bytes = b"", etag: str = "") -> None:
+                body = body or json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def add_project(self, project_id: int) -> None:
+        """Lay the fields out as on an instance shared with another project.
+
+        Option lists become scoped to PROJECT_ID, with a second context for
+        ``project_id`` that reuses the same option ids for other labels. Each
+        field also gets two namesakes: one scoped to ``project_id`` (absent
+        from every item) and a global one that is empty on every item.
+        """
+        namesakes = []
+        for field in self.case_fields:
+            config = field["configs"][0]
+            items = config["options"]["items"]
+            if items:
+                config["context"] = {"is_global": False, "project_ids": [PROJECT_ID]}
+                lines = items.splitlines()
+                ids = [line.partition(",")[0] for line in lines]
+                labels = [line.partition(",")[2] for line in reversed(lines)]
+                field["configs"].append(
+                    _config(False, [project_id], "\n".join(f"{i},{label}" for i, label in zip(ids, labels)))
+                )
+            for suffix, config in (("other", _config(False, [project_id], "")), ("legacy", _config(True, None, ""))):
+                namesakes.append({**field, "system_name": f"{field['system_name']}_{suffix}", "configs": [config]})
+
+        self.case_fields.extend(namesakes)
+        for item in [*self.cases, *(test for tests in self.tests.values() for test in tests)]:
+            for field in namesakes:
+                if field["system_name"].endswith("_legacy"):
+                    item[field["system_name"]] = [] if field["type_id"] == 12 else None
+
+    @classmethod
+    def from_frames(cls, baseline_df: pd.DataFrame, plan_df: pd.DataFrame) -> "MockTestRailServer":
+        """Seed the server from baseline and plan dataframes in CSV export layout.
+
+        Dropdown and multi-select columns become TestRail option ids, plan
+        Desktop rows become one run and the rows after the empty row another.
+        """
+        columns = [
+            col
+            for col in dict.fromkeys([*baseline_df.columns, *plan_df.columns])
+            if col not in (AutomationDataProcessor.ID_COL, AutomationDataProcessor.STATUS_COL, "Title")
+        ]
+        options: Dict[str, Dict[str, int]] = {col: {} for col in columns}
+        case_fields = []
+        for col in columns:
+            type_id = 6 if col in DROPDOWN_COLUMNS else 12 if col in MULTI_SELECT_COLUMNS else 1
+            case_fields.append({
+                "system_name": _system_name(col),
+                "label": col,
+                "type_id": type_id,
+                "configs": [_config(True, None, "")],
+            })
+
+        statuses: Dict[str, int] = {}
+
+        def encode(row: pd.Series) -> Dict[str, Any]:
+            item: Dict[str, Any] = {}
+            if "Title" in row and pd.notna(row["Title"]):
+                item["title"] = str(row["Title"])
+            for field in case_fields:
+                col = field["label"]
+                value = row.get(col)
+                value = str(value) if value is not None and pd.notna(value) else ""
+                if field["type_id"] == 6:
+                    item[field["system_name"]] = _option_id(options[col], value) if value else None
+                elif field["type_id"] == 12:
+                    reasons = [reason.strip() for reason in value.split("\n") if reason.strip()]
+                    item[field["system_name"]] = [_option_id(options[col], reason) for reason in reasons]
+                else:
+                    item[field["system_name"]] = value or None
+            return item
+
+        cases = []
+        for i, (_, row) in enumerate(baseline_df.iterrows(), start=1):
+            cases.append({"id": i, **encode(row)})
+
+        id_col = AutomationDataProcessor.ID_COL
+        split = plan_df.index[plan_df[id_col].isna()] if id_col in plan_df.columns else []
+        sections = [plan_df]
+        if len(split) > 0:
+            sections = [plan_df.iloc[: split[0]], plan_df.iloc[split[0] + 1 :]]
+
+        tests: Dict[int, List[Dict]] = {}
+        next_test_id = 1
+        for run_id, section in zip((DESKTOP_RUN_ID, MOBILE_RUN_ID), sections):
+            tests[run_id] = []
+            for _, row in section.iterrows():
+                status = row.get(AutomationDataProcessor.STATUS_COL)
+                status = str(status) if status is not None and pd.notna(status) else "Untested"
+                tests[run_id].append(
+                    {"id": next_test_id, "status_id": _option_id(statuses, status), **encode(row)}
+                )
+                next_test_id += 1
+
+        for field in case_fields:
+            items = options[field["label"]]
+            field["configs"][0]["options"]["items"] = "\n".join(f"{i}, {label}" for label, i in items.items())
+
+        runs = [
+            {"id": run_id, "name": "Consolidated plan", "config": config}
+            for run_id, config in ((DESKTOP_RUN_ID, "Desktop"), (MOBILE_RUN_ID, "Mobile"))
+            if run_id in tests
+        ]
+        return cls(
+            case_fields=case_fields,
+            statuses=[{"id": i, "name": label.lower(), "label": label} for label, i in statuses.items()],
+            cases=cases,
+            plan={"id": PLAN_ID, "project_id": PROJECT_ID, "entries": [{"id": "entry", "runs": runs}]},
+            tests=tests,
+        )
+
+
+def _system_name(label: str) -> str:
+    """TestRail-style custom field system name for a column label."""
+    return "custom_" + "".join(ch if ch.isalnum() else "_" for ch in label.lower())
+
+
+def _config(is_global: bool, project_ids: Optional[List[int]], items: str) -> Dict[str, Any]:
+    """Case field config for a context with the given option items."""
+    return {"context": {"is_global": is_global, "project_ids": project_ids}, "options": {"items": items}}
+
+
+def _option_id(options: Dict[str, int], label: str) -> int:
+    """Id of an option label, registering it on first use."""
+    return options.setdefault(label, len(options) + 1)